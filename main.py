@@ -1,9 +1,4 @@
-from mcp_cli import cli
-
-
-def main() -> int:
-    return cli.main()
-
+from mcp_cli.cli import main
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,179 +1,265 @@
 from __future__ import annotations
 
-import argparse
-import asyncio
-import contextlib
+import atexit
+import functools
 import json
 import logging
+import sys
 import textwrap
-from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
-
-from .client import AsyncMCPClient
-from .logging_utils import get_current_log_file, setup_logging
-from .models import (
-    ClientCapabilities,
-    ClientInfo,
-    ContentBlock,
-    ElicitationRequest,
-    ElicitationResponse,
-    HandshakeResult,
-    PromptArgument,
-    PromptDefinition,
-    PromptRenderResult,
-    ResourceContent,
-    ResourceDescriptor,
-    ResourceTemplate,
-    RootDescriptor,
-    SamplingMessage,
-    SamplingRequest,
-    SamplingResponse,
-    ServerCapabilities,
-    ServerInfo,
-    ToolCallResult,
-    ToolDefinition,
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, NoReturn, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder.
+    orjson = None
+
+if TYPE_CHECKING:
+    # asyncio dominates import time; `--help` and argument errors should not pay for it.
+    import asyncio
+
+    from .sampling import LocalLLMSamplingProvider
+
+LOG = logging.getLogger("mcp_cli.cli")
+
+DEFAULT_INSTRUCTIONS = "Investigate negotiated MCP capabilities and produce a capability blueprint."
+
+_USAGE = "usage: mcp-cli [-h] [demo] [--instructions INSTRUCTIONS] [--quiet] [--sort-keys]\n"
+_HELP = (
+    _USAGE
+    + "\n"
+    "MCP demo CLI with client/server handshake simulation.\n"
+    "\n"
+    "commands:\n"
+    "  demo                  Run a capability-exploration walkthrough showcasing MCP features.\n"
+    "\n"
+    "options:\n"
+    "  -h, --help            show this help message and exit\n"
+    "  --instructions INSTRUCTIONS\n"
+    "                        Custom server instructions to include in the handshake response.\n"
+    "  --quiet               Print only the summary; skip the JSON payload, server logs and resource updates.\n"
+    "  --sort-keys           Sort JSON payload keys for stable, diffable output.\n"
 )
-from .sampling import LocalLLMSamplingProvider
-from .server import AsyncMCPServer
-from .transport import InMemoryTransport
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="mcp-cli",
-        description="MCP demo CLI with client/server handshake simulation.",
-    )
-    subparsers = parser.add_subparsers(dest="command")
+@dataclass(frozen=True)
+class CLIArguments:
+    command: str = "demo"
+    instructions: str = DEFAULT_INSTRUCTIONS
+    quiet: bool = False
+    sort_keys: bool = False
+
+
+def _usage_error(message: str) -> NoReturn:
+    sys.stderr.write(f"{_USAGE}mcp-cli: error: {message}\n")
+    raise SystemExit(2)
+
+
+def parse_argv(argv: Optional[Sequence[str]] = None) -> CLIArguments:
+    """Parse CLI arguments by hand; the single subcommand does not warrant argparse."""
+    tokens = list(sys.argv[1:] if argv is None else argv)
+    command = "demo"
+    instructions = DEFAULT_INSTRUCTIONS
+    quiet = False
+    sort_keys = False
+
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        index += 1
+        if token in ("-h", "--help"):
+            sys.stdout.write(_HELP)
+            raise SystemExit(0)
+        if token == "demo":
+            command = token
+        elif token == "--instructions":
+            # Like argparse, do not swallow the next flag as the value.
+            if index >= len(tokens) or tokens[index].startswith("--"):
+                _usage_error("argument --instructions: expected one argument")
+            instructions = tokens[index]
+            index += 1
+        elif token.startswith("--instructions="):
+            instructions = token.partition("=")[2]
+        elif token == "--quiet":
+            quiet = True
+        elif token == "--sort-keys":
+            sort_keys = True
+        else:
+            _usage_error(f"unrecognized arguments: {token}")
 
-    demo = subparsers.add_parser(
-        "demo",
-        help="Run a capability-exploration walkthrough showcasing MCP features.",
-    )
-    demo.add_argument(
-        "--instructions",
-        default="Investigate negotiated MCP capabilities and produce a capability blueprint.",
-        help="Custom server instructions to include in the handshake response.",
+    return CLIArguments(command=command, instructions=instructions, quiet=quiet, sort_keys=sort_keys)
+
+
+_LIST_CHANGED_NOTIFICATIONS = {
+    "notifications/resources/list_changed": "resources",
+    "notifications/tools/list_changed": "tools",
+    "notifications/prompts/list_changed": "prompts",
+}
+
+
+_SNIPPET_CHARS = 1024
+
+
+def _snippet(text: str) -> str:
+    """Return the first line of ``text``, cut at ``_SNIPPET_CHARS`` with a trailing ellipsis."""
+    head = text[: _SNIPPET_CHARS + 1]
+    line, newline, _ = head.partition("\n")
+    if not newline and len(line) > _SNIPPET_CHARS:
+        return line[:_SNIPPET_CHARS] + "…"
+    return line
+
+
+def _ignore_notification(params: Dict[str, Any]) -> None:
+    """Notification handler for --quiet runs, which do not record what they would not print."""
+
+
+_CAPABILITY_NOTES_TEMPLATE = (
+    "### Capability Summary\n"
+    "- Focus: {focus}\n"
+    "- Constraints: {constraints}\n"
+    "- Verification: {verification}"
+)
+_CAPABILITY_NOTE_DEFAULTS = {
+    "focus": "(auto) Context protocol refinement",
+    "constraints": "(auto) Honor existing resource/security boundaries",
+    "verification": "(auto) Run agreed verification command",
+}
+
+
+def _render_capability_notes(context: Dict[str, str]) -> str:
+    return _CAPABILITY_NOTES_TEMPLATE.format_map(
+        {key: context.get(key) or default for key, default in _CAPABILITY_NOTE_DEFAULTS.items()}
     )
 
-    parser.set_defaults(
-        command="demo",
-        instructions="Investigate negotiated MCP capabilities and produce a capability blueprint.",
+
+def _format_log_lines(entries: List[Dict[str, Any]]) -> str:
+    """Return the log notifications as one ``- [level] logger: key=value`` line each."""
+    lines = []
+    for entry in entries:
+        data = entry.get("data") or {}
+        details = ", ".join(f"{key}={value}" for key, value in data.items()) if isinstance(data, dict) else str(data)
+        lines.append(f"- [{entry.get('level', 'info')}] {entry.get('logger', 'server')}: {details}")
+    return "\n".join(lines)
+
+
+def _orjson_option(sort_keys: bool) -> int:
+    # OPT_NON_STR_KEYS matches the stdlib fallback, which stringifies the keys of server-supplied data.
+    return orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+
+def _dump_json(payload: Any, *, sort_keys: bool = False) -> str:
+    """Render a payload as indented JSON in insertion order, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=_orjson_option(sort_keys)).decode("utf-8")
+    return json.dumps(payload, indent=2, sort_keys=sort_keys)
+
+
+def _write_report(header: str, payload: Optional[Dict[str, Any]], footer: str, *, sort_keys: bool = False) -> None:
+    """Emit the demo report in one write, handing orjson's UTF-8 bytes straight to a UTF-8 stdout buffer."""
+    stream = sys.stdout
+    if payload is None:
+        stream.write(f"{header}{footer}")
+        return
+    buffer = getattr(stream, "buffer", None)
+    encoding = (getattr(stream, "encoding", None) or "").lower()
+    if orjson is None or buffer is None or encoding not in ("utf-8", "utf8"):
+        stream.write(f"{header}{_dump_json(payload, sort_keys=sort_keys)}\n{footer}")
+        return
+    stream.flush()
+    buffer.write(
+        b"".join(
+            [
+                header.encode("utf-8"),
+                orjson.dumps(payload, option=_orjson_option(sort_keys)),
+                b"\n",
+                footer.encode("utf-8"),
+            ]
+        )
     )
-    return parser
 
 
-async def run_demo(*, instructions: Optional[str] = None) -> int:
-    logger = logging.getLogger("mcp_cli.cli")
+async def run_demo(*, instructions: Optional[str] = None, quiet: bool = False, sort_keys: bool = False) -> int:
+    import asyncio
+
+    from .client import AsyncMCPClient
+    from .demo_fixtures import (
+        CHECKLIST_DESCRIPTOR,
+        CHECKLIST_TEXT,
+        CLIENT_CAPABILITIES,
+        CLIENT_CAPABILITIES_JSON,
+        CLIENT_CAPABILITIES_PAYLOAD,
+        CLIENT_INFO,
+        CLIENT_INFO_PAYLOAD,
+        DEMO_NOTES_CONTENT,
+        DEMO_NOTES_DESCRIPTOR,
+        ECHO_TOOL,
+        ELICITATION_MESSAGE,
+        ELICITATION_SCHEMA,
+        JOURNAL_DESCRIPTOR,
+        JOURNAL_PLACEHOLDER_TEXT,
+        RELEASE_NOTES_TEMPLATE,
+        SERVER_CAPABILITIES,
+        SERVER_INFO,
+        SUMMARIZE_PROMPT,
+        WORKSPACE_LOGS_DESCRIPTOR,
+        WORKSPACE_LOGS_PATH,
+        WORKSPACE_ROOT_DESCRIPTOR,
+    )
+    from .logging_utils import get_current_log_file
+    from .models import (
+        ContentBlock,
+        ElicitationRequest,
+        ElicitationResponse,
+        HandshakeResult,
+        PromptRenderResult,
+        ResourceContent,
+        RootDescriptor,
+        SamplingMessage,
+        SamplingRequest,
+        SamplingResponse,
+        ToolCallResult,
+    )
+    from .server import AsyncMCPServer
+    from .transport import InMemoryTransport
+
     log_path = get_current_log_file()
     if log_path is not None:
-        logger.debug("Demo run writing logs to %s", log_path)
+        LOG.debug("Demo run writing logs to %s", log_path)
 
     transport = InMemoryTransport()
 
-    echo_definition = ToolDefinition(
-        name="echo",
-        title="Echo",
-        description="Echo arguments back as text output.",
-        input_schema={
-            "type": "object",
-            "properties": {
-                "message": {
-                    "type": "string",
-                    "description": "Message to echo back from the server tool.",
-                }
-            },
-            "required": ["message"],
-        },
-    )
-
     async def echo_handler(arguments: Dict[str, Any]) -> ToolCallResult:
         message = str(arguments.get("message", ""))
-        logger.info("Echo tool invoked with message=%s", message)
+        LOG.info("Echo tool invoked with message=%s", message)
         return ToolCallResult(
             content=[ContentBlock(type="text", text=f"ECHO: {message}")],
             is_error=False,
         )
 
-    resource_text = (
-        "# MCP Capability Field Notes\n\n"
-        "- Illustrates how handshake, tools, resources, prompts, and sampling interlock.\n"
-        "- Highlights transport telemetry and logging for troubleshooting.\n"
-        "- Showcases client-led capabilities such as roots, sampling, and elicitation.\n"
-    )
-    resource_descriptor = ResourceDescriptor(
-        uri="memory:///guides/demo-notes",
-        name="demo-notes.md",
-        title="MCP Demo Notes",
-        description="Overview of the MCP CLI demonstration.",
-        mime_type="text/markdown",
-    )
-    resource_content = ResourceContent(
-        uri=resource_descriptor.uri,
-        name=resource_descriptor.name,
-        title=resource_descriptor.title,
-        mime_type=resource_descriptor.mime_type,
-        text=resource_text,
-    )
-
-    checklist_text = (
-        "## Capability Checklist\n\n"
-        "1. Inspect negotiated handshake data.\n"
-        "2. Probe resource subscriptions and updates.\n"
-        "3. Capture telemetry-driven insights.\n"
-        "4. Compose a capability blueprint informed by elicitation.\n"
-    )
-    checklist_descriptor = ResourceDescriptor(
-        uri="memory:///guides/checklist",
-        name="checklist.md",
-        title="CLI Checklist",
-        description="Steps executed during the demo run.",
-        mime_type="text/markdown",
-    )
-    checklist_content = ResourceContent(
-        uri=checklist_descriptor.uri,
-        name=checklist_descriptor.name,
-        title=checklist_descriptor.title,
-        mime_type=checklist_descriptor.mime_type,
-        text=checklist_text,
-    )
-    base_checklist_text = checklist_text
     elicited_context: Dict[str, str] = {
         "focus": "",
         "constraints": "",
         "verification": "",
     }
-
-    journal_descriptor = ResourceDescriptor(
-        uri="memory:///reports/capability-journal",
-        name="capability-journal.md",
-        title="Capability Journal",
-        description="LLM-generated notes captured during the demo run.",
-        mime_type="text/markdown",
+    checklist_content = ResourceContent(
+        uri=CHECKLIST_DESCRIPTOR.uri,
+        name=CHECKLIST_DESCRIPTOR.name,
+        title=CHECKLIST_DESCRIPTOR.title,
+        mime_type=CHECKLIST_DESCRIPTOR.mime_type,
+        text=f"{CHECKLIST_TEXT}\n\n{_render_capability_notes(elicited_context)}",
     )
+
     journal_content = ResourceContent(
-        uri=journal_descriptor.uri,
-        name=journal_descriptor.name,
-        title=journal_descriptor.title,
-        mime_type=journal_descriptor.mime_type,
-        text="# Capability Journal\n\n(Waiting for elicitation input.)",
+        uri=JOURNAL_DESCRIPTOR.uri,
+        name=JOURNAL_DESCRIPTOR.name,
+        title=JOURNAL_DESCRIPTOR.title,
+        mime_type=JOURNAL_DESCRIPTOR.mime_type,
+        text=JOURNAL_PLACEHOLDER_TEXT,
     )
-    journal_entries: List[str] = []
+    # Keyed by note title so re-capturing a note replaces it in constant time.
+    journal_entries: Dict[str, str] = {}
     journal_dirty = False
 
-    def render_capability_notes() -> str:
-        lines = ["### Capability Summary"]
-        focus = elicited_context.get("focus") or "(auto) Context protocol refinement"
-        constraints = elicited_context.get("constraints") or "(auto) Honor existing resource/security boundaries"
-        verification = elicited_context.get("verification") or "(auto) Run agreed verification command"
-        lines.append(f"- Focus: {focus}")
-        lines.append(f"- Constraints: {constraints}")
-        lines.append(f"- Verification: {verification}")
-        return "\n".join(lines)
-
-    checklist_content.text = (
-        f"{base_checklist_text}\n\n{render_capability_notes()}"
-    )
-
     # Echo tool stays minimal and demonstrates tool invocation without bespoke handlers.
 
     async def auto_complete_elicitation(
@@ -183,11 +269,10 @@ async def run_demo(*, instructions: Optional[str] = None) -> int:
     ) -> Dict[str, Any]:
         provider = getattr(client, "_sampling_provider", None)
         if provider is None or not missing_keys:
-            logger.info("Sampling provider unavailable; using placeholder auto responses.")
+            LOG.info("Sampling provider unavailable; using placeholder auto responses.")
             return {key: provided.get(key, f"auto-{key}") for key in missing_keys}
 
-        prompt = textwrap.dedent(
-            f"""You are assisting with Model Context Protocol elicitation.
+        prompt = f"""You are assisting with Model Context Protocol elicitation.
 
 Original request: {request.message or 'n/a'}
 Fields needing values: {', '.join(missing_keys) or 'none'}
@@ -195,7 +280,6 @@ Fields already provided: {json.dumps(provided, ensure_ascii=False)}
 
 Return a JSON object containing only the requested field names and string values.
 """
-        )
 
         try:
             sampling_response = await provider.create_message(
@@ -212,9 +296,9 @@ Return a JSON object containing only the requested field names and string values
             )
             raw_text = sampling_response.content.text or ""
             payload = json.loads(raw_text)
-            logger.debug("Auto elicitation payload=%s", payload)
+            LOG.debug("Auto elicitation payload=%s", payload)
         except Exception as exc:  # noqa: BLE001
-            logger.warning("Auto elicitation failed to parse: %s", exc)
+            LOG.warning("Auto elicitation failed to parse: %s", exc)
             payload = {}
 
         suggestions: Dict[str, Any] = {}
@@ -229,36 +313,15 @@ Return a JSON object containing only the requested field names and string values
 
         return suggestions
 
-    template = ResourceTemplate(
-        uri_template="memory:///releases/{version}",
-        name="release-notes",
-        title="Release Notes Template",
-        description="Generate release notes URI for a given version.",
-        mime_type="text/markdown",
-    )
-
     resource_map = {
-        resource_descriptor.uri: resource_content,
-        checklist_descriptor.uri: checklist_content,
-        journal_descriptor.uri: journal_content,
+        DEMO_NOTES_DESCRIPTOR.uri: DEMO_NOTES_CONTENT,
+        CHECKLIST_DESCRIPTOR.uri: checklist_content,
+        JOURNAL_DESCRIPTOR.uri: journal_content,
     }
 
-    summarize_prompt = PromptDefinition(
-        name="summarize-resource",
-        title="Summarize Resource",
-        description="Creates a user message instructing the assistant to summarize a resource.",
-        arguments=[
-            PromptArgument(
-                name="uri",
-                description="Resource URI to summarize",
-                required=True,
-            )
-        ],
-    )
-
     async def summarize_prompt_handler(arguments: Dict[str, Any]) -> PromptRenderResult:
-        uri = str(arguments.get("uri", resource_descriptor.uri))
-        selected = resource_map.get(uri, resource_content)
+        uri = str(arguments.get("uri", DEMO_NOTES_DESCRIPTOR.uri))
+        selected = resource_map.get(uri, DEMO_NOTES_CONTENT)
         text = selected.text or selected.title or uri
         message_text = (
             "Please read the following resource and provide a concise summary:\n\n"
@@ -302,7 +365,8 @@ Return a JSON object containing only the requested field names and string values
                 "Press Enter to let the local model suggest a value.\n> "
             )
             try:
-                user_value = input(prompt_text).strip()
+                # Typing happens on a worker thread so the loop keeps serving the transport meanwhile.
+                user_value = (await asyncio.to_thread(input, prompt_text)).strip()
             except EOFError:
                 user_value = ""
             if user_value:
@@ -316,67 +380,47 @@ Return a JSON object containing only the requested field names and string values
             manual_responses,
         )
 
-        combined = {**auto_responses, **manual_responses}
+        # auto_complete_elicitation returns a fresh dict of strings, so typed answers can win in place.
+        combined = auto_responses
+        combined.update(manual_responses)
         if not combined:
-            logger.info("Elicitation skipped; no responses captured.")
+            LOG.info("Elicitation skipped; no responses captured.")
             return ElicitationResponse(action="decline")
 
-        elicited_context.update({key: str(value) for key, value in combined.items()})
+        elicited_context.update(combined)
         checklist_content.text = (
-            f"{base_checklist_text}\n\n{render_capability_notes()}"
+            f"{CHECKLIST_TEXT}\n\n{_render_capability_notes(elicited_context)}"
         )
 
-        logger.info(
+        LOG.info(
             "Responding to elicitation request with action=accept fields=%s",
             list(combined.keys()),
         )
         return ElicitationResponse(action="accept", content=combined)
 
     server = AsyncMCPServer(
-        capabilities=ServerCapabilities(
-            logging={},
-            prompts={"listChanged": True},
-            resources={"subscribe": True, "listChanged": True},
-            tools={"listChanged": True},
-        ),
-        server_info=ServerInfo(
-            name="ExampleServer",
-            version="0.1.0",
-            title="Example Server Display Name",
-        ),
+        capabilities=SERVER_CAPABILITIES,
+        server_info=SERVER_INFO,
         instructions=instructions,
         tools=[
-            (echo_definition, echo_handler),
+            (ECHO_TOOL, echo_handler),
         ],
         resources=[
-            (resource_descriptor, resource_content),
-            (checklist_descriptor, checklist_content),
-            (journal_descriptor, journal_content),
+            (DEMO_NOTES_DESCRIPTOR, DEMO_NOTES_CONTENT),
+            (CHECKLIST_DESCRIPTOR, checklist_content),
+            (JOURNAL_DESCRIPTOR, journal_content),
         ],
-        prompts=[(summarize_prompt, summarize_prompt_handler)],
-        resource_templates=[template],
+        prompts=[(SUMMARIZE_PROMPT, summarize_prompt_handler)],
+        resource_templates=[RELEASE_NOTES_TEMPLATE],
     )
     client = AsyncMCPClient(
-        capabilities=ClientCapabilities(
-            sampling={},
-            roots={"listChanged": True},
-            elicitation={},
-        ),
-        client_info=ClientInfo(
-            name="ExampleClient",
-            version="0.1.0",
-            title="Example Client Display Name",
-        ),
+        capabilities=CLIENT_CAPABILITIES,
+        client_info=CLIENT_INFO,
     )
-    client.set_sampling_provider(LocalLLMSamplingProvider())
+    client.set_sampling_provider(_sampling_provider())
     client.set_elicitation_handler(handle_elicitation)
 
-    workspace_root = Path(__file__).resolve().parent.parent
-    workspace_root_descriptor = RootDescriptor(
-        uri=workspace_root.as_uri(),
-        name=workspace_root.name or "workspace",
-    )
-    client.set_roots([workspace_root_descriptor])
+    client.set_roots([WORKSPACE_ROOT_DESCRIPTOR])
 
     client_roots: List[RootDescriptor] = []
     elicitation_result: Optional[ElicitationResponse] = None
@@ -390,201 +434,198 @@ Return a JSON object containing only the requested field names and string values
     }
     log_messages: List[Dict[str, Any]] = []
 
-    async def on_resource_update(params: Dict[str, Any]) -> None:
+    # Notification handlers stay synchronous: none of them awaits, and the client only builds and awaits a
+    # coroutine when a handler returns one.
+    def on_resource_update(params: Dict[str, Any]) -> None:
         resource_updates.append(params)
-        logger.info("Resource update received for %s", params.get("uri"))
+        LOG.info("Resource update received for %s", params.get("uri"))
 
     client.register_notification_handler(
         "notifications/resources/updated",
-        on_resource_update,
+        _ignore_notification if quiet else on_resource_update,
     )
 
-    def _list_changed(kind: str) -> None:
+    def on_list_changed(kind: str, params: Dict[str, Any]) -> None:
         list_change_events[kind] += 1
-        logger.info("%s list changed", kind.capitalize())
+        LOG.info("%s list changed", kind.capitalize())
 
-    client.register_notification_handler(
-        "notifications/resources/list_changed",
-        lambda params: _list_changed("resources"),
-    )
-    client.register_notification_handler(
-        "notifications/tools/list_changed",
-        lambda params: _list_changed("tools"),
-    )
-    client.register_notification_handler(
-        "notifications/prompts/list_changed",
-        lambda params: _list_changed("prompts"),
-    )
-    
-    async def on_server_log(params: Dict[str, Any]) -> None:
+    for method, kind in _LIST_CHANGED_NOTIFICATIONS.items():
+        client.register_notification_handler(method, functools.partial(on_list_changed, kind))
+
+    def on_server_log(params: Dict[str, Any]) -> None:
         payload = params if isinstance(params, dict) else {}
         log_messages.append(payload)
-        level = payload.get("level", "info")
-        logger_name = payload.get("logger", "server")
-        data = payload.get("data") or {}
-        logger.debug(
-            "Server log notification level=%s logger=%s data=%s",
-            level,
-            logger_name,
-            data,
-        )
-
-    client.register_notification_handler(
-        "notifications/message",
-        on_server_log,
-    )
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(
+                "Server log notification level=%s logger=%s data=%s",
+                payload.get("level", "info"),
+                payload.get("logger", "server"),
+                payload.get("data") or {},
+            )
 
-    server_task = asyncio.create_task(server.serve(transport.server_endpoint()))
+    # Recorded even with --quiet: the diagnostic sampling prompt reads the recent server logs.
+    client.register_notification_handler("notifications/message", on_server_log)
 
-    try:
-        await client.connect(transport.client_endpoint())
-        handshake: HandshakeResult = await client.initialize()
-        logger.info("Handshake complete; protocol=%s", handshake.protocol_version)
-
-        await client.set_logging_level("debug")
-
-        elicitation_result = await server.request_elicitation(
-            message="Share the focus, constraints, and verification step for this MCP capability refinement.",
-            requested_schema={
-                "type": "object",
-                "properties": {
-                    "focus": {
-                        "type": "string",
-                        "description": "What capability or behaviour do we want to improve?",
-                    },
-                    "constraints": {
-                        "type": "string",
-                        "description": "List any constraints, risks, or systems that limit the change.",
-                    },
-                    "verification": {
-                        "type": "string",
-                        "description": "How would we verify that the improvement worked (command, test, metric)?",
-                    },
-                },
-                "required": ["focus"],
-            },
-        )
-        if (
-            elicitation_result.action == "accept"
-            and elicitation_result.content
-        ):
-            elicited_context.update(
-                {k: str(v) for k, v in elicitation_result.content.items()}
-            )
-        else:
-            logger.info(
-                "Elicitation returned action=%s; using default context.",
-                elicitation_result.action,
-            )
+    async with asyncio.TaskGroup() as task_group:
+        task_group.create_task(server.serve(transport.server_endpoint()))
+        # Exiting closes the client first; its shutdown notification ends the serve loop so the group can join it.
+        async with server, client:
+            await client.connect(transport.client_endpoint())
+            handshake: HandshakeResult = await client.initialize()
+            LOG.info("Handshake complete; protocol=%s", handshake.protocol_version)
+            server_capabilities_payload = handshake.server_capabilities.to_payload()
 
-        client_roots = await server.list_client_roots()
-        logger.info("Server observed %d workspace root(s).", len(client_roots))
+            await client.set_logging_level("debug")
 
-        logs_path = workspace_root / "logs"
-        if logs_path.exists():
-            log_root_descriptor = RootDescriptor(
-                uri=logs_path.resolve().as_uri(),
-                name=f"{workspace_root_descriptor.name} logs"
-                if workspace_root_descriptor.name
-                else "Logs",
+            elicitation_result = await server.request_elicitation(
+                message=ELICITATION_MESSAGE,
+                requested_schema=ELICITATION_SCHEMA,
             )
-            if not any(root.uri == log_root_descriptor.uri for root in client_roots):
-                updated_roots = list(client_roots) + [log_root_descriptor]
-                client.set_roots(updated_roots)
-                await client.notify_roots_list_changed()
-                list_change_events["roots"] += 1
-                client_roots = await server.list_client_roots()
-
-        tools = await client.list_tools()
-        logger.info("Discovered %d tool(s).", len(tools))
-        tools_by_name = {tool.name: tool for tool in tools}
-
-        resources = await client.list_resources()
-        logger.info("Discovered %d resource(s).", len(resources))
-        resource_snippets: Dict[str, str] = {}
-        for descriptor in resources:
-            await client.subscribe_resource(descriptor.uri)
-        for descriptor in resources:
-            contents = await client.read_resource(descriptor.uri)
-            snippet = ""
-            if contents:
-                snippet = (contents[0].text or "").strip()
-            resource_snippets[descriptor.uri] = snippet
-
-        async def append_journal_entry(title: str, body: str) -> None:
-            nonlocal journal_dirty
-            cleaned = body.strip() or "(no content recorded)"
-            filtered = [
-                entry
-                for entry in journal_entries
-                if not entry.startswith(f"## {title}")
-            ]
-            filtered.append(f"## {title}\n{cleaned}")
-            journal_entries[:] = filtered
-            journal_content.text = "# Capability Journal\n\n" + "\n\n".join(journal_entries)
-            resource_snippets[journal_descriptor.uri] = journal_content.text.strip()
-            journal_dirty = True
-
-        async def capture_sampling_note(
-            title: str,
-            prompt_text: str,
-            *,
-            fallback: str,
-        ) -> SamplingResponse:
-            logger.info("Requesting sampling note '%s'", title)
-            try:
-                result = await server.request_sampling(
-                    messages=[
-                        SamplingMessage(
-                            role="user",
-                            content=ContentBlock(type="text", text=prompt_text),
-                        )
-                    ],
-                    system_prompt=(
-                        "You are an MCP capability analyst summarizing negotiated "
-                        "features and proposing follow-up explorations."
-                    ),
-                    max_tokens=220,
+            if (
+                elicitation_result.action == "accept"
+                and elicitation_result.content
+            ):
+                elicited_context.update(
+                    {k: str(v) for k, v in elicitation_result.content.items()}
                 )
-                content_text = result.content.text or ""
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Sampling note '%s' failed: %s", title, exc)
-                content_text = fallback
-                result = SamplingResponse(
-                    role="assistant",
-                    content=ContentBlock(type="text", text=content_text),
-                    model="cli-fallback",
-                    stop_reason="synthetic",
+            else:
+                LOG.info(
+                    "Elicitation returned action=%s; using default context.",
+                    elicitation_result.action,
                 )
-            await append_journal_entry(title, content_text)
-            return result
 
-        prompts = await client.list_prompts()
-        logger.info("Discovered %d prompt(s).", len(prompts))
+            client_roots = await server.list_client_roots()
+            LOG.info("Server observed %d workspace root(s).", len(client_roots))
+
+            if WORKSPACE_LOGS_PATH.exists():
+                if not any(root.uri == WORKSPACE_LOGS_DESCRIPTOR.uri for root in client_roots):
+                    updated_roots = list(client_roots) + [WORKSPACE_LOGS_DESCRIPTOR]
+                    client.set_roots(updated_roots)
+                    await client.notify_roots_list_changed()
+                    list_change_events["roots"] += 1
+                    client_roots = await server.list_client_roots()
+
+            tools, resources, prompts, resource_templates = await asyncio.gather(
+                client.list_tools(),
+                client.list_resources(),
+                client.list_prompts(),
+                client.list_resource_templates(),
+            )
+            LOG.info("Discovered %d tool(s).", len(tools))
+            LOG.info("Discovered %d resource(s).", len(resources))
+            LOG.info("Discovered %d prompt(s).", len(prompts))
+            LOG.info("Discovered %d resource template(s).", len(resource_templates))
+
+            # Subscribing and reading are independent, so both go out in one gather.
+            subscribe_and_read = await asyncio.gather(
+                *(client.subscribe_resource(descriptor.uri) for descriptor in resources),
+                *(client.read_resource(descriptor.uri) for descriptor in resources),
+            )
+            resource_snippets: Dict[str, str] = {
+                descriptor.uri: (contents[0].text or "").strip() if contents else ""
+                for descriptor, contents in zip(resources, subscribe_and_read[len(resources):])
+            }
 
-        resource_templates = await client.list_resource_templates()
-        logger.info("Discovered %d resource template(s).", len(resource_templates))
+            async def append_journal_entry(title: str, body: str) -> None:
+                nonlocal journal_dirty
+                # A re-captured note moves to the end, matching the order the notes were last written in.
+                journal_entries.pop(title, None)
+                journal_entries[title] = body.strip() or "(no content recorded)"
+                journal_content.text = "# Capability Journal\n\n" + "\n\n".join(
+                    f"## {entry_title}\n{entry_body}" for entry_title, entry_body in journal_entries.items()
+                )
+                resource_snippets[JOURNAL_DESCRIPTOR.uri] = journal_content.text.strip()
+                journal_dirty = True
+
+            async def capture_sampling_note(
+                title: str,
+                prompt_text: str,
+                *,
+                fallback: str,
+            ) -> SamplingResponse:
+                LOG.info("Requesting sampling note '%s'", title)
+                try:
+                    result = await server.request_sampling(
+                        messages=[
+                            SamplingMessage(
+                                role="user",
+                                content=ContentBlock(type="text", text=prompt_text),
+                            )
+                        ],
+                        system_prompt=(
+                            "You are an MCP capability analyst summarizing negotiated "
+                            "features and proposing follow-up explorations."
+                        ),
+                        max_tokens=220,
+                    )
+                    content_text = result.content.text or ""
+                except Exception as exc:  # noqa: BLE001
+                    LOG.warning("Sampling note '%s' failed: %s", title, exc)
+                    content_text = fallback
+                    result = SamplingResponse(
+                        role="assistant",
+                        content=ContentBlock(type="text", text=content_text),
+                        model="cli-fallback",
+                        stop_reason="synthetic",
+                    )
+                await append_journal_entry(title, content_text)
+                return result
+
+            async def call_echo_tool() -> Optional[ToolCallResult]:
+                echo_tool = next((tool for tool in tools if tool.name == "echo"), None)
+                if echo_tool is None:
+                    return None
+                echo_message = " | ".join(
+                    [f"{key}={value}" for key, value in elicited_context.items() if value]
+                ) or "No elicitation context captured"
+                LOG.info("Calling echo tool with elicited context snapshot.")
+                return await client.call_tool(
+                    echo_tool.name,
+                    {"message": f"MCP capabilities anchored in: {echo_message}"},
+                )
 
-        handshake_overview = textwrap.dedent(
-            f"""Instructions: {handshake.instructions or 'None'}
-Client capabilities: {json.dumps(handshake.client_capabilities.to_payload(), indent=2)}
-Server capabilities: {json.dumps(handshake.server_capabilities.to_payload(), indent=2)}
-Roots subscribed: {', '.join(root.uri for root in client_roots) if client_roots else 'None'}
-"""
-        )
+            async def render_first_prompt() -> Optional[PromptRenderResult]:
+                if not prompts:
+                    LOG.warning("No prompts available to render.")
+                    return None
+                prompt_name = prompts[0].name
+                prompt_args = {
+                    "uri": resources[0].uri if resources else DEMO_NOTES_DESCRIPTOR.uri
+                }
+                LOG.info("Rendering prompt '%s'", prompt_name)
+                return await client.get_prompt(prompt_name, prompt_args)
+
+            async def gather_independent_requests() -> Tuple[
+                Optional[ToolCallResult], List[ResourceContent], Optional[PromptRenderResult]
+            ]:
+                return await asyncio.gather(
+                    call_echo_tool(),
+                    client.read_resource(CHECKLIST_DESCRIPTOR.uri),
+                    render_first_prompt(),
+                )
 
-        resource_catalogue = "\n".join(
-            f"- {uri}: {(resource_snippets.get(uri, '').splitlines()[0])}"
-            for uri in resource_snippets
-        )
-        recent_logs = json.dumps(log_messages[-5:], indent=2) if log_messages else "(no logs yet)"
+            await server.notify_resource_updated(
+                CHECKLIST_DESCRIPTOR.uri,
+                title=CHECKLIST_DESCRIPTOR.title,
+            )
+            # The echo call, checklist re-read and prompt render only need the elicited context. Start them now so
+            # their round-trips overlap the sampling chain below, which spends most of its time waiting on the LLM.
+            independent_requests = task_group.create_task(gather_independent_requests())
+
+            handshake_overview = f"""Instructions: {handshake.instructions or 'None'}
+Client capabilities: {CLIENT_CAPABILITIES_JSON}
+Server capabilities: {_dump_json(server_capabilities_payload)}
+Roots subscribed: {', '.join([root.uri for root in client_roots]) if client_roots else 'None'}
+"""
 
-        diagnostic_prompt = textwrap.dedent(
-            f"""Provide a diagnostic summary of the current MCP session.
+            resource_catalogue = "\n".join(
+                [f"- {uri}: {_snippet(snippet) or '(empty)'}" for uri, snippet in resource_snippets.items()]
+            )
+            recent_logs = _format_log_lines(log_messages[-5:]) if log_messages else "(no logs yet)"
 
-Focus: {elicited_context.get('focus') or '(auto)'}
-Constraints: {elicited_context.get('constraints') or '(auto)'}
-Verification idea: {elicited_context.get('verification') or '(auto)'}
+            # Sections that repeat from run to run lead, so a llama.cpp-style server can reuse its cached prompt prefix;
+            # the elicited answers and logs, which change every run, come last.
+            diagnostic_prompt = f"""Provide a diagnostic summary of the current MCP session.
 
 Handshake snapshot:
 {handshake_overview}
@@ -592,40 +633,41 @@ Handshake snapshot:
 Resource catalogue:
 {resource_catalogue}
 
+Focus: {elicited_context.get('focus') or '(auto)'}
+Constraints: {elicited_context.get('constraints') or '(auto)'}
+Verification idea: {elicited_context.get('verification') or '(auto)'}
+
 Recent server logs (up to 5):
 {recent_logs}
 """
-        )
 
-        iteration_results: List[SamplingResponse] = []
-        iteration_results.append(
-            await capture_sampling_note(
-                "Diagnostic summary",
-                diagnostic_prompt,
-                fallback="Diagnostic summary unavailable; inspect handshake manually.",
+            iteration_results: List[SamplingResponse] = []
+            iteration_results.append(
+                await capture_sampling_note(
+                    "Diagnostic summary",
+                    diagnostic_prompt,
+                    fallback="Diagnostic summary unavailable; inspect handshake manually.",
+                )
             )
-        )
 
-        hypothesis_prompt = textwrap.dedent(
-            f"""Using the diagnostic summary below, propose a concrete capability refinement hypothesis.
+            hypothesis_prompt = f"""\
+Using the diagnostic summary below, propose a concrete capability refinement hypothesis.
 
 Diagnostic summary:
 {iteration_results[-1].content.text if iteration_results[-1].content.text else '(empty)'}
 
 Keep within the stated constraints: {elicited_context.get('constraints') or '(none)'}
 """
-        )
 
-        iteration_results.append(
-            await capture_sampling_note(
-                "Refinement hypothesis",
-                hypothesis_prompt,
-                fallback="Hypothesis deferred; capture manually.",
+            iteration_results.append(
+                await capture_sampling_note(
+                    "Refinement hypothesis",
+                    hypothesis_prompt,
+                    fallback="Hypothesis deferred; capture manually.",
+                )
             )
-        )
 
-        action_prompt = textwrap.dedent(
-            f"""Draft an actionable plan that operationalises the refinement hypothesis.
+            action_prompt = f"""Draft an actionable plan that operationalises the refinement hypothesis.
 
 Hypothesis:
 {iteration_results[-1].content.text if iteration_results[-1].content.text else '(empty)'}
@@ -635,152 +677,157 @@ Diagnostic context:
 
 Proposed verification step: {elicited_context.get('verification') or '(not specified)'}
 """
-        )
 
-        iteration_results.append(
-            await capture_sampling_note(
-                "Action plan",
-                action_prompt,
-                fallback="Plan pending; execute verification step manually.",
+            iteration_results.append(
+                await capture_sampling_note(
+                    "Action plan",
+                    action_prompt,
+                    fallback="Plan pending; execute verification step manually.",
+                )
             )
-        )
 
-        sampling_result = iteration_results[-1] if iteration_results else None
+            sampling_result = iteration_results[-1] if iteration_results else None
 
-        if journal_dirty:
-            await server.notify_resource_updated(
-                journal_descriptor.uri,
-                title=journal_descriptor.title,
-            )
+            if journal_dirty:
+                await server.notify_resource_updated(
+                    JOURNAL_DESCRIPTOR.uri,
+                    title=JOURNAL_DESCRIPTOR.title,
+                )
 
-        tool_call_result: Optional[ToolCallResult] = None
-        if "echo" in tools_by_name:
-            echo_message = " | ".join(
-                f"{key}={value}"
-                for key, value in elicited_context.items()
-                if value
-            ) or "No elicitation context captured"
-            logger.info("Calling echo tool with elicited context snapshot.")
-            tool_call_result = await client.call_tool(
-                "echo",
-                {"message": f"MCP capabilities anchored in: {echo_message}"},
+            tool_call_result, updated_contents, prompt_result = await independent_requests
+            if updated_contents:
+                resource_snippets[CHECKLIST_DESCRIPTOR.uri] = (updated_contents[0].text or "").strip()
+
+            await server.notify_resources_list_changed()
+            await server.notify_prompts_list_changed()
+            if not quiet:
+                await server.ping()
+
+            payload: Optional[Dict[str, Any]] = None
+            if not quiet:
+                payload = {
+                    "protocolVersion": handshake.protocol_version,
+                    "client": CLIENT_INFO_PAYLOAD,
+                    "server": handshake.server_info.to_payload(),
+                    "clientCapabilities": CLIENT_CAPABILITIES_PAYLOAD,
+                    "serverCapabilities": server_capabilities_payload,
+                    "tools": [tool.to_payload() for tool in tools],
+                    "resources": [descriptor.to_payload() for descriptor in resources],
+                }
+                optional_fields: Dict[str, Any] = {
+                    "instructions": handshake.instructions,
+                    "roots": [root.to_payload() for root in client_roots],
+                    "toolCall": tool_call_result.to_payload() if tool_call_result is not None else None,
+                    "resourcePreview": resource_snippets,
+                    "resourceTemplates": [template.to_payload() for template in resource_templates],
+                    "prompts": [definition.to_payload() for definition in prompts],
+                    "prompt": prompt_result.to_payload() if prompt_result is not None else None,
+                    "resourceUpdates": resource_updates,
+                    "listChanged": list_change_events,
+                    "sampling": sampling_result.to_payload() if sampling_result is not None else None,
+                    "logs": log_messages,
+                    "elicitation": elicitation_result.to_payload() if elicitation_result is not None else None,
+                }
+                payload.update((key, value) for key, value in optional_fields.items() if value)
+
+            report_lines: List[str] = []
+            if client_roots:
+                report_lines.append("Workspace roots:")
+                for root in client_roots:
+                    label = f" ({root.name})" if root.name else ""
+                    report_lines.append(f"- {root.uri}{label}")
+            report_lines.append(f"Focus: {elicited_context.get('focus') or '(auto) Context protocol refinement'}")
+            report_lines.append(
+                f"Constraints: {elicited_context.get('constraints') or '(auto) Honor existing boundaries'}"
+            )
+            report_lines.append(
+                f"Verification: {elicited_context.get('verification') or '(auto) Run verification command'}"
             )
-
-        await server.notify_resource_updated(
-            checklist_descriptor.uri,
-            title=checklist_descriptor.title,
-        )
-        await asyncio.sleep(0)
-        updated_contents = await client.read_resource(checklist_descriptor.uri)
-        if updated_contents:
-            resource_snippets[checklist_descriptor.uri] = (
-                updated_contents[0].text or ""
-            ).strip()
-
-        prompt_result = None
-        if prompts:
-            prompt_name = prompts[0].name
-            prompt_args = {
-                "uri": resources[0].uri if resources else resource_descriptor.uri
-            }
-            logger.info("Rendering prompt '%s'", prompt_name)
-            prompt_result = await client.get_prompt(prompt_name, prompt_args)
-        else:
-            logger.warning("No prompts available to render.")
-
-        await server.notify_resources_list_changed()
-        await server.notify_prompts_list_changed()
-        await asyncio.sleep(0)
-
-        payload = {
-            "protocolVersion": handshake.protocol_version,
-            "client": handshake.client_info.to_payload(),
-            "server": handshake.server_info.to_payload(),
-            "clientCapabilities": handshake.client_capabilities.to_payload(),
-            "serverCapabilities": handshake.server_capabilities.to_payload(),
-            "tools": [tool.to_payload() for tool in tools],
-            "resources": [descriptor.to_payload() for descriptor in resources],
-        }
-        if handshake.instructions:
-            payload["instructions"] = handshake.instructions
-        if client_roots:
-            payload["roots"] = [root.to_payload() for root in client_roots]
-        if tool_call_result is not None:
-            payload["toolCall"] = tool_call_result.to_payload()
-        if resource_snippets:
-            payload["resourcePreview"] = resource_snippets
-        if resource_templates:
-            payload["resourceTemplates"] = [
-                template.to_payload() for template in resource_templates
-            ]
-        if prompts:
-            payload["prompts"] = [definition.to_payload() for definition in prompts]
-        if prompt_result is not None:
-            payload["prompt"] = prompt_result.to_payload()
-        if resource_updates:
-            payload["resourceUpdates"] = resource_updates
-        if list_change_events:
-            payload["listChanged"] = list_change_events
-        if sampling_result is not None:
-            payload["sampling"] = sampling_result.to_payload()
-        if log_messages:
-            payload["logs"] = log_messages
-        if elicitation_result is not None:
-            payload["elicitation"] = elicitation_result.to_payload()
-
-        print("Handshake succeeded between ExampleClient and ExampleServer.")
-        print(json.dumps(payload, indent=2, sort_keys=True))
-        if client_roots:
-            print("Workspace roots:")
-            for root in client_roots:
-                label = f" ({root.name})" if root.name else ""
-                print(f"- {root.uri}{label}")
-        def _print_summary() -> None:
-            focus = elicited_context.get("focus") or "(auto) Context protocol refinement"
-            constraints = elicited_context.get("constraints") or "(auto) Honor existing boundaries"
-            verification = elicited_context.get("verification") or "(auto) Run verification command"
-            print("Focus:", focus)
-            print("Constraints:", constraints)
-            print("Verification:", verification)
             if iteration_results:
-                print("\nDiagnostic:")
-                print(textwrap.shorten(iteration_results[0].content.text or "(empty)", width=240, placeholder="…"))
+                report_lines.append("\nDiagnostic:")
+                report_lines.append(
+                    textwrap.shorten(iteration_results[0].content.text or "(empty)", width=240, placeholder="…")
+                )
             if len(iteration_results) > 1:
-                print("\nHypothesis:")
-                print(textwrap.shorten(iteration_results[1].content.text or "(empty)", width=240, placeholder="…"))
+                report_lines.append("\nHypothesis:")
+                report_lines.append(
+                    textwrap.shorten(iteration_results[1].content.text or "(empty)", width=240, placeholder="…")
+                )
             if sampling_result is not None and sampling_result.content.text:
-                print("\nAction plan:")
-                print(textwrap.shorten(sampling_result.content.text, width=240, placeholder="…"))
+                report_lines.append("\nAction plan:")
+                report_lines.append(textwrap.shorten(sampling_result.content.text, width=240, placeholder="…"))
             if tool_call_result is not None:
-                text_blocks = [
-                    block.text for block in tool_call_result.content if block.text
-                ]
+                text_blocks = [block.text for block in tool_call_result.content if block.text]
                 if text_blocks:
-                    print("\nEcho tool output:")
-                    print(text_blocks[0])
+                    report_lines.append("\nEcho tool output:")
+                    report_lines.append(text_blocks[0])
+            report_lines.append("")
+
+            _write_report(
+                "Handshake succeeded between ExampleClient and ExampleServer.\n",
+                payload,
+                "\n".join(report_lines),
+                sort_keys=sort_keys,
+            )
+
+            return 0
+
+
+def _event_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's (winloop's on Windows) loop constructor when installed, else None for the default loop."""
+    try:
+        if sys.platform == "win32":
+            import winloop as loop_module
+        else:
+            import uvloop as loop_module
+    except ImportError:
+        return None
+    return loop_module.new_event_loop
+
+
+@functools.cache
+def _demo_runner() -> asyncio.Runner:
+    """Return a process-wide runner so repeated in-process main() calls reuse one event loop."""
+    import asyncio
 
-        _print_summary()
+    runner = asyncio.Runner(loop_factory=_event_loop_factory())
+    atexit.register(runner.close)
+    return runner
 
-        return 0
-    finally:
-        await client.close()
-        await server.shutdown()
-        server_task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await server_task
+
+@functools.cache
+def _sampling_provider() -> LocalLLMSamplingProvider:
+    """Return a process-wide provider so its keep-alive connection outlives a single demo run."""
+    from .sampling import LocalLLMSamplingProvider
+
+    provider = LocalLLMSamplingProvider()
+    atexit.register(provider.close)
+    return provider
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(list(argv) if argv is not None else None)
+    # Materialise argv once: a one-shot iterable would be empty by the time it is logged.
+    arg_list = list(argv) if argv is not None else None
+    args = parse_argv(arg_list)
+
+    from .logging_utils import flush_logging, setup_logging
 
     log_path = setup_logging()
     print(f"Debug log: {log_path}")
-    arg_list = list(argv) if argv is not None else None
-    logging.getLogger("mcp_cli.cli").debug("CLI invoked with args: %s", arg_list)
+    LOG.debug("CLI invoked with args: %s", arg_list)
 
     if args.command == "demo":
-        return asyncio.run(run_demo(instructions=args.instructions))
-
-    parser.error("Unknown command.")
-    return 2
+        try:
+            return _demo_runner().run(
+                run_demo(instructions=args.instructions, quiet=args.quiet, sort_keys=args.sort_keys)
+            )
+        except ExceptionGroup as group:
+            # run_demo supervises the server with a TaskGroup; surface a lone failure as the plain exception.
+            if len(group.exceptions) == 1:
+                raise group.exceptions[0] from None
+            raise
+        finally:
+            # The log file is written by a background thread; make it complete before control returns.
+            flush_logging()
+
+    _usage_error("Unknown command.")
@@ -4,7 +4,7 @@ import asyncio
 import contextlib
 import inspect
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
 
 from . import telemetry
 from .models import (
@@ -54,6 +54,7 @@ class AsyncMCPClient:
         self._request_handlers: Dict[str, RequestHandler] = {}
         self._pending_requests: Dict[int, asyncio.Future] = {}
         self._listener_task: Optional[asyncio.Task] = None
+        self._request_tasks: Set[asyncio.Task] = set()
         self._logger = logging.getLogger("mcp_cli.client")
         self._notification_handlers: Dict[str, NotificationHandler] = {}
         self._roots: List[RootDescriptor] = []
@@ -70,10 +71,11 @@ class AsyncMCPClient:
             "elicitation/create",
             self._handle_elicitation_create,
         )
+        self.register_request_handler("ping", self._handle_ping)
         self._logger.debug(
             "Client instantiated with protocol=%s capabilities=%s",
             protocol_version,
-            capabilities.to_payload(),
+            capabilities,
         )
 
     async def connect(self, endpoint: TransportEndpoint) -> None:
@@ -82,6 +84,12 @@ class AsyncMCPClient:
         if self._listener_task is None or self._listener_task.done():
             self._listener_task = asyncio.create_task(self._listen())
 
+    async def __aenter__(self) -> "AsyncMCPClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
     def set_sampling_provider(self, provider: SamplingProvider) -> None:
         self._sampling_provider = provider
         self._logger.debug("Sampling provider configured: %s", provider)
@@ -246,6 +254,9 @@ class AsyncMCPClient:
             "roots": [root.to_payload() for root in self._roots],
         }
 
+    async def _handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
     async def get_prompt(
         self,
         name: str,
@@ -289,6 +300,8 @@ class AsyncMCPClient:
             await self._endpoint.close()
             self._endpoint = None
             self._logger.debug("Transport endpoint released.")
+            for task in list(self._request_tasks):
+                task.cancel()
             if self._listener_task is not None:
                 self._listener_task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
@@ -320,7 +333,12 @@ class AsyncMCPClient:
                         channel=method,
                     )
                     if message_id is not None:
-                        await self._handle_request(message)
+                        # Server-initiated requests (sampling, elicitation) can be slow; handling them off the
+                        # listener keeps responses to our own in-flight requests flowing. Notifications stay
+                        # inline, so anything received before a request is still handled before it.
+                        task = asyncio.create_task(self._handle_request(message))
+                        self._request_tasks.add(task)
+                        task.add_done_callback(self._request_tasks.discard)
                     else:
                         await self._handle_notification(method, message.get("params"))
                     continue
@@ -0,0 +1,161 @@
+"""Static definitions served by the CLI demo, built once per process."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from .models import (
+    ClientCapabilities,
+    ClientInfo,
+    PromptArgument,
+    PromptDefinition,
+    ResourceContent,
+    ResourceDescriptor,
+    ResourceTemplate,
+    RootDescriptor,
+    ServerCapabilities,
+    ServerInfo,
+    ToolDefinition,
+)
+
+SERVER_CAPABILITIES = ServerCapabilities(
+    logging={},
+    prompts={"listChanged": True},
+    resources={"subscribe": True, "listChanged": True},
+    tools={"listChanged": True},
+)
+SERVER_INFO = ServerInfo(
+    name="ExampleServer",
+    version="0.1.0",
+    title="Example Server Display Name",
+)
+CLIENT_CAPABILITIES = ClientCapabilities(
+    sampling={},
+    roots={"listChanged": True},
+    elicitation={},
+)
+CLIENT_INFO = ClientInfo(
+    name="ExampleClient",
+    version="0.1.0",
+    title="Example Client Display Name",
+)
+# The handshake echoes the client's own objects back, so their payloads never change between runs.
+CLIENT_CAPABILITIES_PAYLOAD = CLIENT_CAPABILITIES.to_payload()
+CLIENT_INFO_PAYLOAD = CLIENT_INFO.to_payload()
+CLIENT_CAPABILITIES_JSON = json.dumps(CLIENT_CAPABILITIES_PAYLOAD, indent=2)
+
+WORKSPACE_ROOT = Path(__file__).resolve().parent.parent
+WORKSPACE_ROOT_DESCRIPTOR = RootDescriptor(
+    uri=WORKSPACE_ROOT.as_uri(),
+    name=WORKSPACE_ROOT.name or "workspace",
+)
+# Only advertised once the directory exists; the demo checks for it on each run.
+WORKSPACE_LOGS_PATH = WORKSPACE_ROOT / "logs"
+WORKSPACE_LOGS_DESCRIPTOR = RootDescriptor(
+    uri=WORKSPACE_LOGS_PATH.resolve().as_uri(),
+    name=f"{WORKSPACE_ROOT_DESCRIPTOR.name} logs" if WORKSPACE_ROOT_DESCRIPTOR.name else "Logs",
+)
+
+ECHO_TOOL = ToolDefinition(
+    name="echo",
+    title="Echo",
+    description="Echo arguments back as text output.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "message": {
+                "type": "string",
+                "description": "Message to echo back from the server tool.",
+            }
+        },
+        "required": ["message"],
+    },
+)
+
+DEMO_NOTES_TEXT = (
+    "# MCP Capability Field Notes\n\n"
+    "- Illustrates how handshake, tools, resources, prompts, and sampling interlock.\n"
+    "- Highlights transport telemetry and logging for troubleshooting.\n"
+    "- Showcases client-led capabilities such as roots, sampling, and elicitation.\n"
+)
+DEMO_NOTES_DESCRIPTOR = ResourceDescriptor(
+    uri="memory:///guides/demo-notes",
+    name="demo-notes.md",
+    title="MCP Demo Notes",
+    description="Overview of the MCP CLI demonstration.",
+    mime_type="text/markdown",
+)
+# Served unchanged on every run; the checklist and journal contents are rewritten per run instead.
+DEMO_NOTES_CONTENT = ResourceContent(
+    uri=DEMO_NOTES_DESCRIPTOR.uri,
+    name=DEMO_NOTES_DESCRIPTOR.name,
+    title=DEMO_NOTES_DESCRIPTOR.title,
+    mime_type=DEMO_NOTES_DESCRIPTOR.mime_type,
+    text=DEMO_NOTES_TEXT,
+)
+
+CHECKLIST_TEXT = (
+    "## Capability Checklist\n\n"
+    "1. Inspect negotiated handshake data.\n"
+    "2. Probe resource subscriptions and updates.\n"
+    "3. Capture telemetry-driven insights.\n"
+    "4. Compose a capability blueprint informed by elicitation.\n"
+)
+CHECKLIST_DESCRIPTOR = ResourceDescriptor(
+    uri="memory:///guides/checklist",
+    name="checklist.md",
+    title="CLI Checklist",
+    description="Steps executed during the demo run.",
+    mime_type="text/markdown",
+)
+
+JOURNAL_PLACEHOLDER_TEXT = "# Capability Journal\n\n(Waiting for elicitation input.)"
+JOURNAL_DESCRIPTOR = ResourceDescriptor(
+    uri="memory:///reports/capability-journal",
+    name="capability-journal.md",
+    title="Capability Journal",
+    description="LLM-generated notes captured during the demo run.",
+    mime_type="text/markdown",
+)
+
+RELEASE_NOTES_TEMPLATE = ResourceTemplate(
+    uri_template="memory:///releases/{version}",
+    name="release-notes",
+    title="Release Notes Template",
+    description="Generate release notes URI for a given version.",
+    mime_type="text/markdown",
+)
+
+SUMMARIZE_PROMPT = PromptDefinition(
+    name="summarize-resource",
+    title="Summarize Resource",
+    description="Creates a user message instructing the assistant to summarize a resource.",
+    arguments=[
+        PromptArgument(
+            name="uri",
+            description="Resource URI to summarize",
+            required=True,
+        )
+    ],
+)
+
+ELICITATION_MESSAGE = "Share the focus, constraints, and verification step for this MCP capability refinement."
+ELICITATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "focus": {
+            "type": "string",
+            "description": "What capability or behaviour do we want to improve?",
+        },
+        "constraints": {
+            "type": "string",
+            "description": "List any constraints, risks, or systems that limit the change.",
+        },
+        "verification": {
+            "type": "string",
+            "description": "How would we verify that the improvement worked (command, test, metric)?",
+        },
+    },
+    "required": ["focus"],
+}
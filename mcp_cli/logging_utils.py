@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
@@ -11,25 +14,24 @@ from . import telemetry
 LOG_ENV_VAR = "MCP_CLI_LOG_DIR"
 LOG_FILE_PREFIX = "mcp-cli"
 LOG_TIME_FORMAT = "%Y%m%d-%H%M%S%f"
+# Already absolute, so runs that use the default directory skip resolving it again.
+_DEFAULT_LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
 
 _current_log_file: Optional[Path] = None
+_listener: Optional[QueueListener] = None
 
 
 def resolve_log_directory() -> Path:
     """Resolve the directory where log files should be written."""
     override = os.getenv(LOG_ENV_VAR)
-    if override:
-        log_dir = Path(override).expanduser()
-    else:
-        log_dir = Path(__file__).resolve().parent.parent / "logs"
-
+    log_dir = Path(override).expanduser().resolve() if override else _DEFAULT_LOG_DIR
     log_dir.mkdir(parents=True, exist_ok=True)
-    return log_dir.resolve()
+    return log_dir
 
 
 def setup_logging() -> Path:
     """Configure the package logger to write to a fresh timestamped file."""
-    global _current_log_file
+    global _current_log_file, _listener
 
     log_dir = resolve_log_directory()
     timestamp = datetime.now().strftime(LOG_TIME_FORMAT)
@@ -40,6 +42,7 @@ def setup_logging() -> Path:
     logger.propagate = False
 
     # Replace existing handlers so each run writes to a new file.
+    _stop_listener()
     for handler in list(logger.handlers):
         handler.close()
         logger.removeHandler(handler)
@@ -50,7 +53,13 @@ def setup_logging() -> Path:
         "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Records are queued from the caller's thread and written by a listener thread, so logging from the
+    # event loop never waits on disk I/O.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
 
     _current_log_file = log_path
     telemetry.initialize(log_dir)
@@ -58,6 +67,28 @@ def setup_logging() -> Path:
     return log_path
 
 
+def flush_logging() -> None:
+    """Block until every record logged so far has been written to the current log file."""
+    if _listener is not None:
+        # stop() drains the queue before joining the writer thread; restart it for later records.
+        _listener.stop()
+        _listener.start()
+
+
+def _stop_listener() -> None:
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
 def get_current_log_file() -> Optional[Path]:
     """Return the log file initialized for the current run, if any."""
     return _current_log_file
+
+
+atexit.register(_stop_listener)
@@ -135,7 +135,7 @@ class HandshakeResult:
     instructions: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ContentBlock:
     type: str
     text: Optional[str] = None
@@ -294,7 +294,7 @@ class ResourceContent:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SamplingMessage:
     role: str
     content: ContentBlock
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import http.client
 import json
 import logging
-import urllib.error
-import urllib.request
+import threading
+import urllib.parse
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Tuple
 
 from .models import ContentBlock, SamplingRequest, SamplingResponse
 
 LOG = logging.getLogger("mcp_cli.sampling")
 
 
+def _proxy_configured(base_url: str) -> bool:
+    """Return True when the *_proxy/no_proxy environment routes ``base_url`` through a proxy."""
+    # Imported on first use (on an executor thread) so importing the client does not pay for urllib.request.
+    import urllib.request
+
+    url = urllib.parse.urlsplit(base_url)
+    return url.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(url.hostname or "")
+
+
 class SamplingProvider(Protocol):
     async def create_message(
         self,
@@ -36,18 +46,22 @@ class LocalLLMSamplingProvider:
 
     def __init__(self, config: Optional[SamplingConfig] = None) -> None:
         self.config = config or SamplingConfig()
+        # One keep-alive connection per provider; requests run on executor threads, so guard it.
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._connection_lock = threading.Lock()
 
     async def create_message(
         self,
         request: SamplingRequest,
     ) -> SamplingResponse:
         payload = self._build_payload(request)
+        body = json.dumps(payload).encode("utf-8")
         LOG.debug("Submitting sampling request to local LLM: %s", payload)
 
         try:
             response_data = await asyncio.get_running_loop().run_in_executor(
                 None,
-                lambda: self._execute_http(payload),
+                lambda: self._execute_http(body),
             )
             LOG.debug("Received response from local LLM: %s", response_data)
             return self._parse_response(response_data)
@@ -63,6 +77,11 @@ class LocalLLMSamplingProvider:
                 stop_reason="error",
             )
 
+    def close(self) -> None:
+        """Close the keep-alive connection; the next request opens a new one."""
+        with self._connection_lock:
+            self._close_connection()
+
     def _build_payload(self, request: SamplingRequest) -> dict:
         messages = []
         if request.system_prompt:
@@ -94,22 +113,67 @@ class LocalLLMSamplingProvider:
 
         return payload
 
-    def _execute_http(self, payload: dict) -> dict:
-        url = f"{self.config.base_url.rstrip('/')}{self.config.path}"
-        data = json.dumps(payload).encode("utf-8")
+    def _execute_http(self, data: bytes) -> dict:
+        if _proxy_configured(self.config.base_url):
+            status, body = self._post_via_urllib(data)
+        else:
+            with self._connection_lock:
+                reused = self._connection is not None
+                try:
+                    status, body = self._post(data)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # The server may have dropped an idle keep-alive connection; retry once on a fresh one.
+                    if not reused:
+                        raise
+                    status, body = self._post(data)
+
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}: {body.decode('utf-8', errors='ignore')}")
+        return json.loads(body.decode("utf-8"))
+
+    def _post(self, data: bytes) -> Tuple[int, bytes]:
+        base = urllib.parse.urlsplit(self.config.base_url)
+        if self._connection is None:
+            connection_class = http.client.HTTPSConnection if base.scheme == "https" else http.client.HTTPConnection
+            self._connection = connection_class(base.hostname or "127.0.0.1", base.port, timeout=self.config.timeout)
+
+        try:
+            self._connection.request(
+                "POST",
+                f"{base.path.rstrip('/')}{self.config.path}",
+                body=data,
+                headers={"Content-Type": "application/json"},
+            )
+            response = self._connection.getresponse()
+            body = response.read()
+        except Exception:
+            self._close_connection()
+            raise
+
+        if response.will_close:
+            self._close_connection()
+        return response.status, body
+
+    def _post_via_urllib(self, data: bytes) -> Tuple[int, bytes]:
+        import urllib.error
+        import urllib.request
+
         request = urllib.request.Request(
-            url,
+            f"{self.config.base_url.rstrip('/')}{self.config.path}",
             data=data,
             headers={"Content-Type": "application/json"},
             method="POST",
         )
-
         try:
-            with urllib.request.urlopen(request, timeout=self.config.timeout) as response:
-                return json.loads(response.read().decode("utf-8"))
+            with urllib.request.build_opener().open(request, timeout=self.config.timeout) as response:
+                return response.status, response.read()
         except urllib.error.HTTPError as http_error:
-            body = http_error.read().decode("utf-8", errors="ignore")
-            raise RuntimeError(f"HTTP {http_error.code}: {body}") from http_error
+            return http_error.code, http_error.read()
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
 
     def _parse_response(self, response: dict) -> SamplingResponse:
         choice = None
@@ -107,7 +107,7 @@ class AsyncMCPServer:
         self._logger.debug(
             "Server instantiated with protocol=%s capabilities=%s",
             protocol_version,
-            capabilities.to_payload(),
+            capabilities,
         )
 
     async def serve(self, endpoint: TransportEndpoint) -> None:
@@ -163,6 +163,12 @@ class AsyncMCPServer:
             await self._endpoint.stop()
             self._logger.debug("Transport stop signal sent.")
 
+    async def __aenter__(self) -> "AsyncMCPServer":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.shutdown()
+
     def register_tool(
         self,
         definition: ToolDefinition,
@@ -220,6 +226,10 @@ class AsyncMCPServer:
         self._logger.debug("Received %d root(s) from client.", len(roots))
         return roots
 
+    async def ping(self) -> None:
+        """Round-trip a ping; the client handles messages in order, so earlier notifications are processed first."""
+        await self._send_request("ping", {})
+
     async def request_elicitation(
         self,
         *,
@@ -267,6 +277,8 @@ class AsyncMCPServer:
             await self._handle_prompts_get(message)
         elif method == "logging/setLevel":
             await self._handle_logging_set_level(message)
+        elif method == "ping":
+            await self._send_with_telemetry({"jsonrpc": "2.0", "id": message.get("id"), "result": {}})
         elif method in {"notifications/shutdown", "client/shutdown"}:
             self._logger.debug("Shutdown notification received; exiting loop.")
             self._running = False
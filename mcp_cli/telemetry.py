@@ -1,24 +1,34 @@
 from __future__ import annotations
 
+import atexit
 import json
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder.
+    orjson = None
 
 _events: List[Dict[str, object]] = []
 _lock = threading.Lock()
 _log_path: Optional[Path] = None
+_log_handle: Optional[TextIO] = None
 
 
 def initialize(log_dir: Path) -> None:
     """Reset the in-memory event store and prepare a JSONL log file."""
-    global _events, _log_path
+    global _events, _log_path, _log_handle
     with _lock:
         _events = []
         log_dir.mkdir(parents=True, exist_ok=True)
         _log_path = (log_dir / "events.jsonl").resolve()
-        _log_path.write_text("", encoding="utf-8")
+        if _log_handle is not None:
+            _log_handle.close()
+        # Kept open for the whole run; line buffering still lands each event on disk for the live viewer.
+        _log_handle = _log_path.open("w", encoding="utf-8", buffering=1)
 
 
 def reset() -> None:
@@ -47,12 +57,18 @@ def record_event(
     with _lock:
         entry["id"] = len(_events)
         _events.append(entry)
-        if _log_path is not None:
-            with _log_path.open("a", encoding="utf-8") as handle:
-                handle.write(json.dumps(entry) + "\n")
+        if _log_handle is not None:
+            _log_handle.write(_encode_event(entry))
     return entry  # type: ignore[return-value]
 
 
+def _encode_event(entry: Dict[str, object]) -> str:
+    """Return ``entry`` as one JSON line, trailing newline included."""
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(entry) + "\n"
+
+
 def get_events(since: int = -1) -> List[Dict[str, object]]:
     """Return events whose id is greater than ``since``."""
     with _lock:
@@ -81,3 +97,14 @@ def load_events_from_file(path: Path) -> List[Dict[str, object]]:
 def log_path() -> Optional[Path]:
     with _lock:
         return _log_path
+
+
+def _close_log_handle() -> None:
+    global _log_handle
+    with _lock:
+        if _log_handle is not None:
+            _log_handle.close()
+            _log_handle = None
+
+
+atexit.register(_close_log_handle)
@@ -17,7 +17,8 @@ class TransportEndpoint:
         self._outgoing = outgoing
 
     async def send(self, message: Any) -> None:
-        await self._outgoing.put(message)
+        # The queues are unbounded, so a put can never wait; skip the extra coroutine Queue.put would create.
+        self._outgoing.put_nowait(message)
 
     async def receive(self) -> Any:
         message = await self._incoming.get()
@@ -26,10 +27,10 @@ class TransportEndpoint:
         return message
 
     async def close(self) -> None:
-        await self._outgoing.put(_CLOSE_SENTINEL)
+        self._outgoing.put_nowait(_CLOSE_SENTINEL)
 
     async def stop(self) -> None:
-        await self._incoming.put(_CLOSE_SENTINEL)
+        self._incoming.put_nowait(_CLOSE_SENTINEL)
 
 
 class InMemoryTransport:
@@ -1,5 +1,7 @@
 import json
 
+import pytest
+
 from mcp_cli import cli
 from mcp_cli.models import ContentBlock, SamplingRequest, SamplingResponse
 
@@ -11,7 +13,7 @@ def _extract_json(output: str) -> dict:
     return json.loads(json_text)
 
 
-def _patch_sampling_provider(monkeypatch, responses=None):
+def _patch_sampling_provider(monkeypatch, responses=None, requests=None):
     payloads = list(responses or ["Stubbed sampling output."])
 
     class _StubProvider:
@@ -19,6 +21,8 @@ def _patch_sampling_provider(monkeypatch, responses=None):
             self._responses = list(payloads)
 
         async def create_message(self, request: SamplingRequest) -> SamplingResponse:
+            if requests is not None:
+                requests.append(request)
             if self._responses:
                 content_value = self._responses.pop(0)
             else:
@@ -36,7 +40,7 @@ def _patch_sampling_provider(monkeypatch, responses=None):
                 stop_reason="endTurn",
             )
 
-    monkeypatch.setattr(cli, "LocalLLMSamplingProvider", lambda: _StubProvider())
+    monkeypatch.setattr(cli, "_sampling_provider", _StubProvider)
 
 
 def _patch_elicitation_inputs(monkeypatch, values):
@@ -180,3 +184,141 @@ def test_cli_elicitation_auto_fill(monkeypatch, capsys):
     assert data["elicitation"]["content"]["constraints"] == "auto-constraints"
     assert data["elicitation"]["content"]["verification"] == "auto-check"
     assert data["sampling"]["content"]["text"] == "Stubbed sampling output."
+
+
+def test_cli_quiet_demo_skips_payload(monkeypatch, capsys):
+    _patch_sampling_provider(monkeypatch, responses=[
+        "Iteration 1 diagnostic",
+        "Iteration 2 hypothesis",
+        "Stubbed sampling output.",
+    ])
+    _patch_elicitation_inputs(monkeypatch, ["Quiet focus", "", ""])
+
+    exit_code = cli.main(["demo", "--quiet"])
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert "Handshake succeeded" in captured.out
+    assert "Focus: Quiet focus" in captured.out
+    assert '"protocolVersion"' not in captured.out
+
+
+def test_cli_parse_argv_accepts_demo_flags(capsys):
+    assert cli.parse_argv([]) == cli.CLIArguments()
+    assert cli.parse_argv(["demo", "--instructions", "Be brief."]).instructions == "Be brief."
+    assert cli.parse_argv(["--instructions=Be terse.", "demo"]).instructions == "Be terse."
+    assert cli.parse_argv(["demo", "--quiet"]).quiet is True
+    assert cli.parse_argv(["--sort-keys"]).sort_keys is True
+
+    for argv, expected_code in (
+        (["--help"], 0),
+        (["demo", "--bogus"], 2),
+        (["--instructions"], 2),
+        (["demo", "--instructions", "--quiet"], 2),
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            cli.parse_argv(argv)
+        assert exc_info.value.code == expected_code
+
+    captured = capsys.readouterr()
+    assert "usage: mcp-cli" in captured.out
+    assert "unrecognized arguments: --bogus" in captured.err
+    assert "argument --instructions: expected one argument" in captured.err
+
+
+def test_cli_sampling_prompts_keep_sections_at_column_zero(monkeypatch, capsys):
+    requests = []
+    _patch_sampling_provider(
+        monkeypatch,
+        responses=["Iteration 1 diagnostic", "Iteration 2 hypothesis", "Stubbed sampling output."],
+        requests=requests,
+    )
+    _patch_elicitation_inputs(monkeypatch, ["Prompt layout", "None", "Read the prompts"])
+
+    assert cli.main(["demo", "--quiet"]) == 0
+    capsys.readouterr()
+
+    prompt_lines = [request.messages[0].content.text.splitlines() for request in requests]
+    diagnostic, hypothesis, action = prompt_lines[-3:]
+    assert "Handshake snapshot:" in diagnostic
+    assert "Resource catalogue:" in diagnostic
+    assert "Focus: Prompt layout" in diagnostic
+    assert "Recent server logs (up to 5):" in diagnostic
+    assert "Diagnostic summary:" in hypothesis
+    assert "Iteration 1 diagnostic" in hypothesis
+    assert "Hypothesis:" in action
+    assert "Proposed verification step: Read the prompts" in action
+
+
+def test_cli_resource_preview_keeps_long_resources_whole(monkeypatch, capsys):
+    long_note = "diagnostic " * cli._SNIPPET_CHARS
+    _patch_sampling_provider(monkeypatch, responses=[long_note, "Iteration 2 hypothesis", "Stubbed sampling output."])
+    _patch_elicitation_inputs(monkeypatch, ["x" * (cli._SNIPPET_CHARS * 2), "None", "Read the report"])
+
+    assert cli.main(["demo"]) == 0
+    data = _extract_json(capsys.readouterr().out)
+
+    assert "x" * (cli._SNIPPET_CHARS * 2) in data["resourcePreview"]["memory:///guides/checklist"]
+    assert long_note.strip() in data["resourcePreview"]["memory:///reports/capability-journal"]
+
+
+def test_cli_snippet_marks_a_cut_first_line():
+    assert cli._snippet("Title\nbody") == "Title"
+    assert cli._snippet("x" * cli._SNIPPET_CHARS) == "x" * cli._SNIPPET_CHARS
+    assert cli._snippet("x" * (cli._SNIPPET_CHARS + 1)) == "x" * cli._SNIPPET_CHARS + "…"
+
+
+def test_cli_sort_keys_orders_report(monkeypatch, capsys):
+    responses = ["Iteration 1 diagnostic", "Iteration 2 hypothesis", "Stubbed sampling output."]
+    answers = ["Key order", "", ""]
+
+    _patch_sampling_provider(monkeypatch, responses=responses)
+    _patch_elicitation_inputs(monkeypatch, answers)
+    assert cli.main(["demo"]) == 0
+    default_keys = list(_extract_json(capsys.readouterr().out))
+
+    _patch_sampling_provider(monkeypatch, responses=responses)
+    _patch_elicitation_inputs(monkeypatch, answers)
+    assert cli.main(["demo", "--sort-keys"]) == 0
+    sorted_data = _extract_json(capsys.readouterr().out)
+
+    assert default_keys != sorted(default_keys)
+    assert list(sorted_data) == sorted(sorted_data)
+    assert list(sorted_data["elicitation"]) == sorted(sorted_data["elicitation"])
+
+
+def test_cli_quiet_demo_still_samples_with_server_logs(monkeypatch, capsys):
+    requests = []
+    _patch_sampling_provider(
+        monkeypatch,
+        responses=["Iteration 1 diagnostic", "Iteration 2 hypothesis", "Stubbed sampling output."],
+        requests=requests,
+    )
+    _patch_elicitation_inputs(monkeypatch, ["Quiet logs", "", ""])
+
+    assert cli.main(["demo", "--quiet"]) == 0
+    capsys.readouterr()
+
+    diagnostic = requests[-3].messages[0].content.text
+    assert "(no logs yet)" not in diagnostic
+    assert "log_level_set" in diagnostic
+
+
+def test_cli_demo_failure_surfaces_the_plain_exception(monkeypatch, capsys):
+    _patch_sampling_provider(monkeypatch)
+
+    async def _failing_initialize(self, *args, **kwargs):
+        raise RuntimeError("initialize failed")
+
+    monkeypatch.setattr("mcp_cli.client.AsyncMCPClient.initialize", _failing_initialize)
+
+    with pytest.raises(RuntimeError, match="initialize failed"):
+        cli.main(["demo"])
+    capsys.readouterr()
+
+
+def test_cli_dump_json_accepts_non_string_keys():
+    payload = {"logs": [{"data": {1: "one", "two": 2}}]}
+
+    assert json.loads(cli._dump_json(payload)) == {"logs": [{"data": {"1": "one", "two": 2}}]}
+    assert cli._dump_json(payload) == json.dumps(payload, indent=2)
@@ -254,6 +254,71 @@ async def test_client_initializes_with_jsonrpc_handshake():
             await server_task
 
 
+@pytest.mark.asyncio
+async def test_server_ping_drains_earlier_notifications():
+    transport = InMemoryTransport()
+    server = AsyncMCPServer(
+        capabilities=ServerCapabilities(tools={"listChanged": True}),
+        server_info=ServerInfo(name="PingServer", version="0.1.0"),
+    )
+    client = AsyncMCPClient(
+        capabilities=ClientCapabilities(),
+        client_info=ClientInfo(name="PingClient", version="0.1.0"),
+    )
+    tool_changes: List[Dict[str, Any]] = []
+    client.register_notification_handler("notifications/tools/list_changed", tool_changes.append)
+
+    server_task = asyncio.create_task(server.serve(transport.server_endpoint()))
+    async with server, client:
+        await client.connect(transport.client_endpoint())
+        await client.initialize()
+
+        await server.notify_tools_list_changed()
+        await server.ping()
+
+        assert tool_changes == [{}]
+        ping_reply = server.received_messages[-1]
+        assert ping_reply["result"] == {}
+
+    # Leaving the context closes the client, whose shutdown notification ends the serve loop.
+    await asyncio.wait_for(server_task, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_client_serves_own_requests_while_sampling_is_pending():
+    transport = InMemoryTransport()
+    server = AsyncMCPServer(
+        capabilities=ServerCapabilities(tools={"listChanged": True}),
+        server_info=ServerInfo(name="SlowSamplingServer", version="0.1.0"),
+    )
+    client = AsyncMCPClient(
+        capabilities=ClientCapabilities(sampling={}),
+        client_info=ClientInfo(name="SlowSamplingClient", version="0.1.0"),
+    )
+    provider = _BlockingSamplingProvider()
+    client.set_sampling_provider(provider)
+
+    server_task = asyncio.create_task(server.serve(transport.server_endpoint()))
+    async with server, client:
+        await client.connect(transport.client_endpoint())
+        await client.initialize()
+
+        sampling_task = asyncio.create_task(
+            server.request_sampling(
+                messages=[SamplingMessage(role="user", content=ContentBlock(type="text", text="Hold on."))],
+            )
+        )
+        await wait_for_condition(lambda: provider.started.is_set())
+
+        assert await asyncio.wait_for(client.list_tools(), timeout=1) == []
+
+        provider.release.set()
+        sampling_result = await sampling_task
+        assert sampling_result.content.text == "Released."
+
+    await asyncio.wait_for(server_task, timeout=1)
+
+
 class _StubSamplingProvider(SamplingProvider):
     async def create_message(self, request: SamplingRequest) -> SamplingResponse:
         return SamplingResponse(
@@ -265,3 +330,19 @@ class _StubSamplingProvider(SamplingProvider):
             model="stub",
             stop_reason="endTurn",
         )
+
+
+class _BlockingSamplingProvider(SamplingProvider):
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def create_message(self, request: SamplingRequest) -> SamplingResponse:
+        self.started.set()
+        await self.release.wait()
+        return SamplingResponse(
+            role="assistant",
+            content=ContentBlock(type="text", text="Released."),
+            model="stub",
+            stop_reason="endTurn",
+        )
@@ -0,0 +1,123 @@
+import http.client
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mcp_cli.sampling import LocalLLMSamplingProvider, SamplingConfig
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    server = _ChatServer()
+    yield server
+    server.stop()
+
+
+def test_local_provider_reuses_one_connection_across_requests(chat_server):
+    provider = LocalLLMSamplingProvider(SamplingConfig(base_url=chat_server.base_url))
+    try:
+        assert provider._execute_http(b"{}")["choices"][0]["message"]["content"] == "reply 1"
+        assert provider._execute_http(b"{}")["choices"][0]["message"]["content"] == "reply 2"
+    finally:
+        provider.close()
+
+    first_port, second_port = [port for port, _ in chat_server.requests]
+    assert first_port == second_port
+
+
+def test_local_provider_close_releases_the_connection(chat_server):
+    provider = LocalLLMSamplingProvider(SamplingConfig(base_url=chat_server.base_url))
+    provider._execute_http(b"{}")
+    provider.close()
+    assert provider._connection is None
+
+    try:
+        assert provider._execute_http(b"{}")["choices"][0]["message"]["content"] == "reply 2"
+    finally:
+        provider.close()
+    provider.close()
+
+    first_port, second_port = [port for port, _ in chat_server.requests]
+    assert first_port != second_port
+
+
+def test_local_provider_retries_once_when_idle_connection_was_dropped(chat_server):
+    chat_server.mode = "close_after_reply"
+    provider = LocalLLMSamplingProvider(SamplingConfig(base_url=chat_server.base_url))
+    try:
+        provider._execute_http(b"{}")
+        assert provider._execute_http(b"{}")["choices"][0]["message"]["content"] == "reply 2"
+    finally:
+        provider.close()
+
+    first_port, second_port = [port for port, _ in chat_server.requests]
+    assert first_port != second_port
+
+
+def test_local_provider_does_not_retry_on_a_fresh_connection(chat_server):
+    chat_server.mode = "hang_up"
+    provider = LocalLLMSamplingProvider(SamplingConfig(base_url=chat_server.base_url))
+
+    with pytest.raises(http.client.RemoteDisconnected):
+        provider._execute_http(b"{}")
+    assert len(chat_server.requests) == 1
+
+
+def test_local_provider_sends_through_configured_proxy(chat_server, monkeypatch):
+    monkeypatch.setenv("http_proxy", chat_server.base_url)
+    monkeypatch.delenv("no_proxy", raising=False)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    provider = LocalLLMSamplingProvider(SamplingConfig(base_url="http://llm.invalid:8080"))
+
+    assert provider._execute_http(b"{}")["choices"][0]["message"]["content"] == "reply 1"
+    assert provider._connection is None
+    assert chat_server.requests[0][1] == "http://llm.invalid:8080/v1/chat/completions"
+
+
+class _ChatServer:
+    """HTTP/1.1 chat-completions stub; ``mode`` picks how it treats the connection after each request."""
+
+    def __init__(self) -> None:
+        self.mode = "keep_alive"
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+        self._server.daemon_threads = True
+        self._server.chat = self
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        chat = self.server.chat
+        chat.requests.append((self.client_address[1], self.path))
+        if chat.mode == "hang_up":
+            self.close_connection = True
+            return
+
+        body = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": f"reply {len(chat.requests)}"}}]}
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Closing without a "Connection: close" header looks like an idle keep-alive timeout to the client.
+        self.close_connection = chat.mode == "close_after_reply"
+
+    def log_message(self, format: str, *args) -> None:
+        pass